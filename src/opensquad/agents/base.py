@@ -1,10 +1,29 @@
 """Base agent class for OpenSquad agents."""
 
+import asyncio
+import json
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
 
 from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+from .scheduler import LLMScheduler, get_default_scheduler
+from .structured import StreamParser, StructuredOutputError
+
+T = TypeVar("T")
 
 
 class AgentRole(str, Enum):
@@ -25,6 +44,8 @@ class AgentConfig(BaseModel):
     model: str = "llama3"
     temperature: float = 0.7
     base_url: str = "http://localhost:11434"
+    priority: Optional[int] = None
+    tenant: str = "default"
 
 
 class AgentState(BaseModel):
@@ -47,14 +68,17 @@ class BaseAgent(ABC):
     - Return structured results
     """
 
-    def __init__(self, config: AgentConfig):
+    def __init__(self, config: AgentConfig, scheduler: Optional[LLMScheduler] = None):
         """Initialize the agent with configuration.
 
         Args:
             config: Agent configuration including model settings
+            scheduler: Scheduler for LLM calls. If None, uses the shared default.
         """
         self.config = config
         self.state: Optional[AgentState] = None
+        self.llm: Any = None
+        self.scheduler = scheduler or get_default_scheduler()
 
     @abstractmethod
     def get_system_prompt(self) -> str:
@@ -114,3 +138,225 @@ class BaseAgent(ABC):
             self.state.status = status
             self.state.result = result
             self.state.error = error
+
+    def _llm_slot(self, priority: Optional[int] = None) -> AsyncContextManager[None]:
+        """Return a scheduler slot for one LLM call by this agent.
+
+        Args:
+            priority: Optional per-request priority overriding the config's
+
+        Returns:
+            Async context manager holding the slot while entered
+        """
+        return self.scheduler.slot(
+            self.config.role.value,
+            priority=priority if priority is not None else self.config.priority,
+            tenant=self.config.tenant
+        )
+
+    def _release_llm_slot(self, call: "asyncio.Future[Any]") -> None:
+        """Release the slot of a finished LLM call, consuming any exception.
+
+        Args:
+            call: Future of the worker-thread LLM call
+        """
+        if not call.cancelled():
+            call.exception()
+        self.scheduler.release()
+
+    async def _invoke_llm(self, prompt: str, priority: Optional[int] = None) -> str:
+        """Send a prompt to the agent's LLM through the scheduler.
+
+        Args:
+            prompt: Full prompt to send to the LLM
+            priority: Optional per-request priority overriding the config's
+
+        Returns:
+            Completion text
+
+        Raises:
+            RuntimeError: If the agent has no LLM configured
+        """
+        if self.llm is None:
+            raise RuntimeError(f"Agent {self.config.name} has no LLM configured")
+        await self.scheduler.acquire(
+            self.config.role.value,
+            priority=priority if priority is not None else self.config.priority,
+            tenant=self.config.tenant
+        )
+        # The worker thread cannot be cancelled, so the slot is released when
+        # the call actually finishes rather than when the awaiting task exits.
+        call = asyncio.ensure_future(asyncio.to_thread(self.llm.invoke, prompt))
+        call.add_done_callback(self._release_llm_slot)
+        response: str = await asyncio.shield(call)
+        return response
+
+    async def _stream_llm(
+        self,
+        prompt: str,
+        priority: Optional[int] = None
+    ) -> AsyncGenerator[str, None]:
+        """Stream completion chunks for a prompt from the agent's LLM.
+
+        Generation runs in a separate task that buffers chunks, so the
+        scheduler slot is held only while the backend is generating, not
+        while the caller processes chunks. Closing the stream early aborts
+        generation and releases the slot.
+
+        Args:
+            prompt: Full prompt to send to the LLM
+            priority: Optional per-request priority overriding the config's
+
+        Yields:
+            Completion text chunks in order
+
+        Raises:
+            RuntimeError: If the agent has no LLM configured
+        """
+        if self.llm is None:
+            raise RuntimeError(f"Agent {self.config.name} has no LLM configured")
+        queue: "asyncio.Queue[Union[str, Exception, None]]" = asyncio.Queue()
+        producer = asyncio.create_task(self._produce_llm_stream(prompt, priority, queue))
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+        finally:
+            if not producer.done():
+                producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+    async def _produce_llm_stream(
+        self,
+        prompt: str,
+        priority: Optional[int],
+        queue: "asyncio.Queue[Union[str, Exception, None]]"
+    ) -> None:
+        """Generate a completion into a queue while holding a scheduler slot.
+
+        Args:
+            prompt: Full prompt to send to the LLM
+            priority: Optional per-request priority overriding the config's
+            queue: Receives each chunk, then None at the end or the exception
+                that stopped generation
+        """
+        try:
+            async with self._llm_slot(priority):
+                async for chunk in self.llm.astream(prompt):
+                    queue.put_nowait(chunk)
+        except Exception as e:
+            queue.put_nowait(e)
+            return
+        queue.put_nowait(None)
+
+    async def stream_structured(
+        self,
+        prompt: str,
+        parser_factory: Callable[[], StreamParser[T]],
+        max_retries: int = 2,
+        priority: Optional[int] = None
+    ) -> AsyncIterator[T]:
+        """Stream structured items parsed incrementally from the LLM output.
+
+        Items are yielded as soon as the parser completes them. If the output
+        becomes invalid, generation is aborted immediately and retried with the
+        parse error and the items already yielded appended to the prompt. A
+        retry must reproduce those items before it may yield new ones; if it
+        diverges from them the stream fails rather than mixing two generations.
+
+        Args:
+            prompt: Full prompt to send to the LLM
+            parser_factory: Callable returning a fresh parser for each attempt
+            max_retries: Number of retries after the first invalid attempt
+            priority: Optional per-request priority overriding the config's
+
+        Yields:
+            Validated items in output order
+
+        Raises:
+            StructuredOutputError: If every attempt produced invalid output, or
+                a retry diverged from items already yielded
+        """
+        yielded: List[T] = []
+        attempt_prompt = prompt
+        last_error: Optional[StructuredOutputError] = None
+
+        for _ in range(max_retries + 1):
+            parser = parser_factory()
+            position = 0
+            diverged = False
+            stream = self._stream_llm(attempt_prompt, priority)
+            items = self._parse_stream(stream, parser)
+            try:
+                async for item in items:
+                    if position < len(yielded):
+                        if item != yielded[position]:
+                            diverged = True
+                            break
+                    else:
+                        yielded.append(item)
+                        yield item
+                    position += 1
+                else:
+                    if position >= len(yielded):
+                        return
+                    diverged = True
+            except StructuredOutputError as e:
+                last_error = e
+                attempt_prompt = self._retry_prompt(prompt, e, yielded)
+            finally:
+                await items.aclose()
+                await stream.aclose()
+
+            if diverged:
+                raise StructuredOutputError(
+                    f"Retried output diverged from already yielded item {position + 1}"
+                )
+
+        raise StructuredOutputError(
+            f"No valid output after {max_retries + 1} attempts: {last_error}"
+        )
+
+    def _retry_prompt(self, prompt: str, error: StructuredOutputError, yielded: List[Any]) -> str:
+        """Build the prompt for retrying after invalid structured output.
+
+        Args:
+            prompt: Original prompt
+            error: Parse error of the failed attempt
+            yielded: Items already yielded to the caller
+
+        Returns:
+            Prompt asking for valid output that repeats the accepted items
+        """
+        retry_prompt = f"{prompt}\n\nYour previous response was invalid: {error}."
+        if yielded:
+            accepted = json.dumps(to_jsonable_python(yielded))
+            retry_prompt += (
+                f"\nThese items from it were already accepted: {accepted}\n"
+                "Repeat them exactly and in the same order, then continue after them."
+            )
+        return f"{retry_prompt}\nRespond again with valid output only."
+
+    async def _parse_stream(
+        self,
+        stream: AsyncIterator[str],
+        parser: StreamParser[T]
+    ) -> AsyncGenerator[T, None]:
+        """Yield the items a parser completes while consuming a stream.
+
+        Args:
+            stream: Completion text chunks
+            parser: Parser for this attempt
+
+        Yields:
+            Items in output order, including those completed at end of stream
+        """
+        async for chunk in stream:
+            for item in parser.feed(chunk):
+                yield item
+        for item in parser.close():
+            yield item
@@ -5,6 +5,7 @@ from typing import Any, Dict, Optional
 from langchain_ollama import OllamaLLM
 
 from .base import AgentConfig, AgentRole, BaseAgent
+from .scheduler import LLMScheduler
 
 
 class HelloAgent(BaseAgent):
@@ -16,11 +17,16 @@ class HelloAgent(BaseAgent):
     - Serves as a template for other agents
     """
 
-    def __init__(self, config: Optional[AgentConfig] = None):
+    def __init__(
+        self,
+        config: Optional[AgentConfig] = None,
+        scheduler: Optional[LLMScheduler] = None
+    ):
         """Initialize HelloAgent with optional configuration.
 
         Args:
             config: Agent configuration. If None, uses defaults.
+            scheduler: Scheduler for LLM calls. If None, uses the shared default.
         """
         if config is None:
             config = AgentConfig(
@@ -29,7 +35,7 @@ class HelloAgent(BaseAgent):
                 model="llama3",
                 temperature=0.7
             )
-        super().__init__(config)
+        super().__init__(config, scheduler)
         self.llm = OllamaLLM(
             model=self.config.model,
             temperature=self.config.temperature,
@@ -73,8 +79,8 @@ Keep your responses brief (1-2 sentences) and friendly."""
             # Create full prompt with system context
             full_prompt = f"{self.get_system_prompt()}\n\nUser: {task}\n\nAssistant:"
 
-            # Call Ollama LLM
-            response = self.llm.invoke(full_prompt)
+            # Call Ollama LLM through the shared scheduler
+            response = await self._invoke_llm(full_prompt)
 
             # Update state and return success
             result = {
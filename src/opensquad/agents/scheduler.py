@@ -0,0 +1,366 @@
+"""Priority-aware fair scheduler for LLM calls sharing one backend.
+
+All agent LLM calls acquire a slot from an LLMScheduler before reaching the
+backend. Waiting requests are ordered by priority (lower is more urgent),
+aged over time so low-priority work cannot starve, and interleaved across
+tenants with start-time weighted fair queuing.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+DEFAULT_ROLE_PRIORITIES: Dict[str, int] = {
+    "reviewer": 0,
+    "architect": 1,
+    "backend": 2,
+    "frontend": 2,
+    "qa": 3,
+}
+DEFAULT_PRIORITY = 2
+
+
+class SchedulerMetrics(BaseModel):
+    """Snapshot of scheduler queue and wait-time metrics."""
+
+    max_concurrency: int
+    in_flight: int
+    queue_depth: int
+    queue_depth_by_role: Dict[str, int] = {}
+    queue_depth_by_tenant: Dict[str, int] = {}
+    granted: int = 0
+    avg_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    avg_wait_seconds_by_role: Dict[str, float] = {}
+
+
+class _Waiter:
+    """A request waiting for a scheduler slot."""
+
+    __slots__ = ("role", "tenant", "priority", "virtual_start", "start_tag", "seq",
+                 "enqueued_at", "future")
+
+    def __init__(
+        self,
+        role: str,
+        tenant: str,
+        priority: int,
+        virtual_start: float,
+        start_tag: float,
+        seq: int,
+        enqueued_at: float,
+        future: "asyncio.Future[None]"
+    ):
+        """Initialize a waiter.
+
+        Args:
+            role: Agent role value of the caller
+            tenant: Tenant the request is accounted to
+            priority: Base priority; lower is more urgent
+            virtual_start: Scheduler virtual time when the request was queued
+            start_tag: Fair-queuing start tag of the request
+            seq: Arrival sequence number
+            enqueued_at: Clock time when the request was queued
+            future: Resolved when the slot is granted
+        """
+        self.role = role
+        self.tenant = tenant
+        self.priority = priority
+        self.virtual_start = virtual_start
+        self.start_tag = start_tag
+        self.seq = seq
+        self.enqueued_at = enqueued_at
+        self.future = future
+
+
+class LLMScheduler:
+    """Central admission queue for LLM calls.
+
+    Scheduling order:
+    - Effective priority: the request's priority minus one level for every
+      aging_interval seconds it has waited (starvation protection)
+    - Weighted fair queuing across tenants (pipelines) within a priority
+    - Arrival order as the final tie-breaker
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        role_priorities: Optional[Dict[str, int]] = None,
+        tenant_weights: Optional[Dict[str, float]] = None,
+        aging_interval: float = 10.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            max_concurrency: Concurrent calls allowed against the backend;
+                match this to the server's parallelism (e.g. OLLAMA_NUM_PARALLEL)
+            role_priorities: Priority per agent role value; lower is more urgent
+            tenant_weights: Relative share per tenant; unlisted tenants get 1.0
+            aging_interval: Seconds of waiting that raise a request one priority level
+            clock: Monotonic time source in seconds
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if aging_interval <= 0:
+            raise ValueError("aging_interval must be positive")
+        self.max_concurrency = max_concurrency
+        self.role_priorities = dict(DEFAULT_ROLE_PRIORITIES if role_priorities is None
+                                    else role_priorities)
+        self.tenant_weights = dict(tenant_weights or {})
+        self.aging_interval = aging_interval
+        self._clock = clock
+        self._waiters: List[_Waiter] = []
+        self._in_flight = 0
+        self._seq = 0
+        self._virtual_time = 0.0
+        self._tenant_finish: Dict[str, float] = {}
+        self._tenant_dispatched_finish: Dict[str, float] = {}
+        self._granted = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._wait_by_role: Dict[str, float] = {}
+        self._count_by_role: Dict[str, int] = {}
+
+    def priority_for(self, role: str, priority: Optional[int] = None) -> int:
+        """Resolve the base priority of a request.
+
+        Args:
+            role: Agent role value of the caller
+            priority: Optional per-request override
+
+        Returns:
+            Explicit priority if given, otherwise the role's priority
+        """
+        if priority is not None:
+            return priority
+        return self.role_priorities.get(role, DEFAULT_PRIORITY)
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        role: str,
+        priority: Optional[int] = None,
+        tenant: str = "default"
+    ) -> AsyncIterator[None]:
+        """Hold a backend slot for the duration of the block.
+
+        Args:
+            role: Agent role value of the caller
+            priority: Optional per-request priority overriding the role's
+            tenant: Tenant or pipeline the request is accounted to
+
+        Yields:
+            None once the slot has been granted
+        """
+        await self.acquire(role, priority, tenant)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(
+        self,
+        role: str,
+        priority: Optional[int] = None,
+        tenant: str = "default"
+    ) -> None:
+        """Wait for a backend slot; every successful call must be paired with release().
+
+        Prefer slot(). Use this when the slot must outlive the awaiting task,
+        e.g. to hold it until an uncancellable worker thread finishes.
+
+        Args:
+            role: Agent role value of the caller
+            priority: Optional per-request priority overriding the role's
+            tenant: Tenant or pipeline the request is accounted to
+        """
+        await self._acquire(role, self.priority_for(role, priority), tenant)
+
+    def release(self) -> None:
+        """Return a slot obtained with acquire() and admit the next waiter."""
+        self._release()
+
+    def metrics(self) -> SchedulerMetrics:
+        """Return a snapshot of queue depth and wait-time metrics.
+
+        Returns:
+            Current scheduler metrics
+        """
+        by_role: Dict[str, int] = {}
+        by_tenant: Dict[str, int] = {}
+        for waiter in self._waiters:
+            by_role[waiter.role] = by_role.get(waiter.role, 0) + 1
+            by_tenant[waiter.tenant] = by_tenant.get(waiter.tenant, 0) + 1
+        return SchedulerMetrics(
+            max_concurrency=self.max_concurrency,
+            in_flight=self._in_flight,
+            queue_depth=len(self._waiters),
+            queue_depth_by_role=by_role,
+            queue_depth_by_tenant=by_tenant,
+            granted=self._granted,
+            avg_wait_seconds=self._total_wait / self._granted if self._granted else 0.0,
+            max_wait_seconds=self._max_wait,
+            avg_wait_seconds_by_role={
+                role: total / self._count_by_role[role]
+                for role, total in self._wait_by_role.items()
+            },
+        )
+
+    async def _acquire(self, role: str, priority: int, tenant: str) -> None:
+        """Grant a slot immediately if free, otherwise queue and wait for one.
+
+        Args:
+            role: Agent role value of the caller
+            priority: Resolved base priority of the request
+            tenant: Tenant the request is accounted to
+
+        Raises:
+            asyncio.CancelledError: If cancelled while waiting; the request is
+                removed from the queue, or its slot handed on if just granted
+        """
+        now = self._clock()
+        if self._in_flight < self.max_concurrency and not self._waiters:
+            self._in_flight += 1
+            self._record_wait(role, 0.0)
+            return
+
+        start_tag = max(self._virtual_time, self._tenant_finish.get(tenant, 0.0))
+        self._tenant_finish[tenant] = start_tag + self._cost(tenant)
+        self._seq += 1
+        waiter = _Waiter(
+            role=role,
+            tenant=tenant,
+            priority=priority,
+            virtual_start=self._virtual_time,
+            start_tag=start_tag,
+            seq=self._seq,
+            enqueued_at=now,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._waiters.append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Slot was granted just before cancellation; hand it on
+                self._release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                self._rewind_tenant(waiter)
+            raise
+
+    def _release(self) -> None:
+        """Free one slot and admit queued requests into the free capacity."""
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant slots to the best queued requests while capacity remains.
+
+        Requests cancelled while still queued are dropped without a slot.
+        """
+        now = self._clock()
+        while self._waiters and self._in_flight < self.max_concurrency:
+            waiter = min(self._waiters, key=lambda w: self._sort_key(w, now))
+            self._waiters.remove(waiter)
+            if waiter.future.done():
+                # Cancelled while queued; its task has not run its handler yet
+                self._rewind_tenant(waiter)
+                continue
+            self._virtual_time = max(self._virtual_time, waiter.start_tag)
+            self._tenant_dispatched_finish[waiter.tenant] = max(
+                self._tenant_dispatched_finish.get(waiter.tenant, 0.0),
+                waiter.start_tag + self._cost(waiter.tenant)
+            )
+            self._in_flight += 1
+            self._record_wait(waiter.role, now - waiter.enqueued_at)
+            waiter.future.set_result(None)
+
+    def _cost(self, tenant: str) -> float:
+        """Return the virtual time one request advances a tenant by.
+
+        Args:
+            tenant: Tenant the request is accounted to
+
+        Returns:
+            Inverse of the tenant's weight
+        """
+        return 1.0 / self.tenant_weights.get(tenant, 1.0)
+
+    def _rewind_tenant(self, cancelled: _Waiter) -> None:
+        """Give back the fair-queuing share of a request that was never served.
+
+        Later queued requests of the same tenant are re-tagged as if the
+        cancelled request had never been queued, and the tenant's finish tag
+        is rolled back accordingly.
+
+        Args:
+            cancelled: Waiter removed from the queue without being granted
+        """
+        finish = cancelled.start_tag
+        later = sorted(
+            (w for w in self._waiters if w.tenant == cancelled.tenant and w.seq > cancelled.seq),
+            key=lambda w: w.seq
+        )
+        for waiter in later:
+            waiter.start_tag = max(waiter.virtual_start, finish)
+            finish = waiter.start_tag + self._cost(waiter.tenant)
+        self._tenant_finish[cancelled.tenant] = max(
+            finish, self._tenant_dispatched_finish.get(cancelled.tenant, 0.0)
+        )
+
+    def _sort_key(self, waiter: _Waiter, now: float) -> Tuple[int, float, int]:
+        """Return the dispatch order key of a waiter; the smallest is served first.
+
+        Args:
+            waiter: Queued request
+            now: Current clock time, used for aging
+
+        Returns:
+            Tuple of aged priority, fair-queuing start tag and arrival sequence
+        """
+        aged_levels = int((now - waiter.enqueued_at) // self.aging_interval)
+        return (waiter.priority - aged_levels, waiter.start_tag, waiter.seq)
+
+    def _record_wait(self, role: str, wait: float) -> None:
+        """Account a granted request in the wait-time metrics.
+
+        Args:
+            role: Agent role value of the request
+            wait: Seconds the request spent queued
+        """
+        self._granted += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+        self._wait_by_role[role] = self._wait_by_role.get(role, 0.0) + wait
+        self._count_by_role[role] = self._count_by_role.get(role, 0) + 1
+
+
+_default_scheduler: Optional[LLMScheduler] = None
+
+
+def get_default_scheduler() -> LLMScheduler:
+    """Return the process-wide scheduler shared by agents without their own.
+
+    Returns:
+        The default LLMScheduler, created on first use
+    """
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = LLMScheduler()
+    return _default_scheduler
+
+
+def set_default_scheduler(scheduler: Optional[LLMScheduler]) -> None:
+    """Replace the process-wide default scheduler.
+
+    Args:
+        scheduler: New default, or None to recreate one on next use
+    """
+    global _default_scheduler
+    _default_scheduler = scheduler
@@ -0,0 +1,424 @@
+"""Incremental parsers for structured agent output.
+
+Parsers consume an LLM completion chunk by chunk and emit validated items
+as soon as they are complete, so agents can act on partial results and
+abort a generation as soon as it becomes invalid.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Generic, List, NoReturn, Optional, TypeVar
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+T = TypeVar("T")
+
+_OPENERS = {"}": "{", "]": "["}
+_SCALAR_CHARS = frozenset("0123456789-+.eEtrufalsn")
+
+
+class StructuredOutputError(Exception):
+    """Raised when streamed output cannot be parsed into the expected schema."""
+
+
+class CodeBlock(BaseModel):
+    """A fenced code block extracted from agent output."""
+
+    language: Optional[str] = None
+    info: str = ""
+    content: str
+
+
+class StreamParser(ABC, Generic[T]):
+    """Abstract base class for incremental structured-output parsers.
+
+    A parser is fed completion chunks in order and returns every item that
+    was completed by each chunk. Once a parser raises StructuredOutputError
+    it stays failed.
+    """
+
+    @abstractmethod
+    def feed(self, chunk: str) -> List[T]:
+        """Consume the next chunk of output.
+
+        Args:
+            chunk: Next piece of the completion text
+
+        Returns:
+            Items completed by this chunk, in output order
+
+        Raises:
+            StructuredOutputError: If the output became invalid
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> List[T]:
+        """Signal the end of the stream.
+
+        Returns:
+            Any items that could only be completed at end of stream
+
+        Raises:
+            StructuredOutputError: If the output ended incomplete
+        """
+        pass
+
+
+class JsonStreamParser(StreamParser[T]):
+    """Parse a JSON array (or a single JSON value) incrementally.
+
+    The root value must start a line: text before the first line beginning
+    with '[' or '{' (preambles, code fences) is skipped, so brackets inside
+    prose do not start parsing. Anything after the root value closes is
+    ignored as well. When the root is an array each
+    element is validated and emitted as soon as it closes; when the root is
+    an object it is emitted as a single item.
+    """
+
+    def __init__(self, schema: Any):
+        """Initialize the parser.
+
+        Args:
+            schema: Pydantic model or any type accepted by pydantic's TypeAdapter
+        """
+        self._adapter: TypeAdapter[Any] = TypeAdapter(schema)
+        self._started = False
+        self._line_start = True
+        self._done = False
+        self._base = 0
+        self._stack: List[str] = []
+        self._expect_comma = False
+        self._after_comma = False
+        self._buffer: List[str] = []
+        self._in_item = False
+        self._in_string = False
+        self._escape = False
+        self._scalar = False
+        self._offset = 0
+        self._error: Optional[StructuredOutputError] = None
+
+    def feed(self, chunk: str) -> List[T]:
+        """Consume the next chunk of output.
+
+        Args:
+            chunk: Next piece of the completion text
+
+        Returns:
+            Items completed by this chunk, in output order
+
+        Raises:
+            StructuredOutputError: If the output became invalid
+        """
+        if self._error:
+            raise self._error
+        items: List[T] = []
+        for ch in chunk:
+            if self._done:
+                break
+            self._consume(ch, items)
+            self._offset += 1
+        return items
+
+    def close(self) -> List[T]:
+        """Signal the end of the stream.
+
+        Returns:
+            Always an empty list; JSON items are emitted from feed()
+
+        Raises:
+            StructuredOutputError: If no complete JSON value was received
+        """
+        if self._error:
+            raise self._error
+        if not self._started:
+            self._fail("no JSON value found in output")
+        if not self._done:
+            self._fail("output ended before the JSON value was complete")
+        return []
+
+    def _fail(self, message: str) -> NoReturn:
+        """Put the parser into the failed state and raise.
+
+        Args:
+            message: Description of the problem
+
+        Raises:
+            StructuredOutputError: Always, with the current character offset
+        """
+        self._error = StructuredOutputError(f"{message} (at offset {self._offset})")
+        raise self._error
+
+    def _consume(self, ch: str, items: List[T]) -> None:
+        """Advance the state machine by one character outside of an item.
+
+        State tracked across calls:
+        - _started / _line_start: whether the root value was found, and
+          whether only blanks precede ch on its line while searching for it
+        - _base: stack depth at which items live (1 inside a root array,
+          0 when the root object itself is the single item)
+        - _expect_comma: an element just closed, so ',' or ']' must follow
+        - _after_comma: a ',' was read, so another element must follow
+        - _in_item: characters belong to the item being buffered, handled
+          by _consume_item()
+
+        Args:
+            ch: Next character of the output
+            items: List completed items are appended to
+        """
+        if not self._started:
+            if ch == "\n":
+                self._line_start = True
+            elif ch in " \t\r":
+                pass
+            elif not self._line_start:
+                pass
+            elif ch == "[":
+                self._started = True
+                self._stack.append(ch)
+                self._base = 1
+            elif ch == "{":
+                self._started = True
+                self._base = 0
+                self._begin_item(ch)
+            else:
+                self._line_start = False
+            return
+
+        if self._in_item:
+            self._consume_item(ch, items)
+            return
+
+        # Between elements of the root array
+        if ch.isspace():
+            return
+        if ch == ",":
+            if not self._expect_comma:
+                self._fail("unexpected ','")
+            self._expect_comma = False
+            self._after_comma = True
+        elif ch == "]":
+            if self._after_comma:
+                self._fail("trailing ',' before ']'")
+            self._stack.pop()
+            self._done = True
+        elif self._expect_comma:
+            self._fail(f"expected ',' or ']' but got {ch!r}")
+        else:
+            self._begin_item(ch)
+
+    def _begin_item(self, ch: str) -> None:
+        """Start buffering a new item at its first character.
+
+        Args:
+            ch: First character of the item
+
+        Raises:
+            StructuredOutputError: If ch cannot start a JSON value
+        """
+        self._in_item = True
+        self._buffer = [ch]
+        if ch in "{[":
+            self._stack.append(ch)
+        elif ch == '"':
+            self._in_string = True
+        elif ch in _SCALAR_CHARS:
+            self._scalar = True
+        else:
+            self._fail(f"unexpected character {ch!r}")
+
+    def _consume_item(self, ch: str, items: List[T]) -> None:
+        """Advance the state machine by one character inside an item.
+
+        State tracked across calls:
+        - _stack: open brackets; the item closes when it returns to _base
+        - _in_string / _escape: inside a string literal, and whether the
+          previous character was a backslash
+        - _scalar: the item is a bare number or literal, which ends at the
+          next ',', ']' or whitespace at item level
+
+        Args:
+            ch: Next character of the output
+            items: List completed items are appended to
+
+        Raises:
+            StructuredOutputError: On mismatched brackets or invalid characters
+        """
+        if self._in_string:
+            self._buffer.append(ch)
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+                if len(self._stack) == self._base:
+                    self._finish_item(items)
+            return
+
+        if self._scalar and (ch in ",]" or ch.isspace()):
+            self._finish_item(items)
+            self._consume(ch, items)
+            return
+
+        if ch == '"':
+            self._in_string = True
+        elif ch in "{[":
+            self._stack.append(ch)
+        elif ch in "}]":
+            if len(self._stack) <= self._base or self._stack[-1] != _OPENERS[ch]:
+                self._fail(f"mismatched {ch!r}")
+            self._stack.pop()
+        elif not (ch.isspace() or ch in ",:" or ch in _SCALAR_CHARS):
+            self._fail(f"unexpected character {ch!r}")
+        self._buffer.append(ch)
+
+        if ch in "}]" and len(self._stack) == self._base:
+            self._finish_item(items)
+
+    def _finish_item(self, items: List[T]) -> None:
+        """Decode and validate the buffered item, then reset item state.
+
+        Args:
+            items: List the validated item is appended to
+
+        Raises:
+            StructuredOutputError: If the item is not valid JSON or fails the schema
+        """
+        text = "".join(self._buffer)
+        self._buffer = []
+        self._in_item = False
+        self._scalar = False
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError as e:
+            self._fail(f"invalid JSON item: {e.msg}")
+        try:
+            items.append(self._adapter.validate_python(value))
+        except ValidationError as e:
+            self._fail(f"item does not match schema: {e.error_count()} validation error(s)")
+        if self._base == 0:
+            self._done = True
+        else:
+            self._expect_comma = True
+            self._after_comma = False
+
+
+class CodeBlockStreamParser(StreamParser[T]):
+    """Parse fenced (```) code blocks incrementally.
+
+    Each block is emitted as soon as its closing fence line arrives. Text
+    outside of blocks is ignored. An opening fence with an info string
+    inside an open block is treated as a missing closing fence.
+    """
+
+    def __init__(self, schema: Any = CodeBlock):
+        """Initialize the parser.
+
+        Args:
+            schema: Model validated from the block's language, info and content
+        """
+        self._adapter: TypeAdapter[Any] = TypeAdapter(schema)
+        self._pending = ""
+        self._in_block = False
+        self._info = ""
+        self._lines: List[str] = []
+        self._line_no = 0
+        self._error: Optional[StructuredOutputError] = None
+
+    def feed(self, chunk: str) -> List[T]:
+        """Consume the next chunk of output.
+
+        Args:
+            chunk: Next piece of the completion text
+
+        Returns:
+            Code blocks closed by this chunk, in output order
+
+        Raises:
+            StructuredOutputError: If the output became invalid
+        """
+        if self._error:
+            raise self._error
+        items: List[T] = []
+        *lines, self._pending = (self._pending + chunk).split("\n")
+        for line in lines:
+            self._consume_line(line, items)
+        return items
+
+    def close(self) -> List[T]:
+        """Signal the end of the stream.
+
+        Returns:
+            A final block whose closing fence had no trailing newline
+
+        Raises:
+            StructuredOutputError: If a code block was left unterminated
+        """
+        if self._error:
+            raise self._error
+        items: List[T] = []
+        if self._pending:
+            self._consume_line(self._pending, items)
+            self._pending = ""
+        if self._in_block:
+            self._fail("output ended inside an unterminated code block")
+        return items
+
+    def _fail(self, message: str) -> NoReturn:
+        """Put the parser into the failed state and raise.
+
+        Args:
+            message: Description of the problem
+
+        Raises:
+            StructuredOutputError: Always, with the current line number
+        """
+        self._error = StructuredOutputError(f"{message} (at line {self._line_no})")
+        raise self._error
+
+    def _consume_line(self, line: str, items: List[T]) -> None:
+        """Process one complete line of output.
+
+        Outside a block, a fence line opens one and records its info string;
+        inside a block, a bare fence closes it and other lines are content.
+
+        Args:
+            line: Line without its trailing newline
+            items: List completed blocks are appended to
+
+        Raises:
+            StructuredOutputError: If a new block opens inside an open block
+        """
+        self._line_no += 1
+        stripped = line.strip()
+        if not self._in_block:
+            if stripped.startswith("```"):
+                self._in_block = True
+                self._info = stripped[3:].strip()
+                self._lines = []
+            return
+
+        if stripped == "```":
+            self._in_block = False
+            self._finish_block(items)
+        elif stripped.startswith("```"):
+            self._fail("code block opened before the previous block was closed")
+        else:
+            self._lines.append(line)
+
+    def _finish_block(self, items: List[T]) -> None:
+        """Validate the closed block against the schema.
+
+        Args:
+            items: List the validated block is appended to
+
+        Raises:
+            StructuredOutputError: If the block fails the schema
+        """
+        language = self._info.split()[0] if self._info else None
+        data = {"language": language, "info": self._info, "content": "\n".join(self._lines)}
+        try:
+            items.append(self._adapter.validate_python(data))
+        except ValidationError as e:
+            self._fail(f"code block does not match schema: {e.error_count()} validation error(s)")
@@ -0,0 +1,6 @@
+"""
+OpenSquad Tools Package
+
+This package contains the tool framework and built-in tools agents use to
+act on their environment (Git, file operations).
+"""
@@ -0,0 +1,74 @@
+"""Base tool class and tool-call models for OpenSquad agents."""
+
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Any, Dict, Optional, Type
+
+from pydantic import BaseModel
+
+
+class ToolError(Exception):
+    """Raised by a tool to report a failure back to the calling agent."""
+
+
+class ToolExecution(str, Enum):
+    """Enum defining where synchronous tools are executed."""
+
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class ToolCall(BaseModel):
+    """A tool invocation requested by an agent."""
+
+    id: str
+    name: str
+    arguments: Dict[str, Any] = {}
+
+
+class ToolResult(BaseModel):
+    """Outcome of a tool call, returned to the agent."""
+
+    call_id: str
+    name: str
+    status: str
+    output: Optional[str] = None
+    error: Optional[str] = None
+    truncated: bool = False
+    cached: bool = False
+    duration_seconds: float = 0.0
+
+
+class Tool(ABC):
+    """Abstract base class for all OpenSquad tools.
+
+    Each tool should:
+    - Define a unique name and a description for the LLM
+    - Declare whether it is side-effect-free (read-only and idempotent)
+    - Implement run() as a coroutine for I/O-bound work, or as a plain
+      function executed in a thread or process pool for blocking work
+    - Raise ToolError for failures the agent should see
+    """
+
+    name: str = ""
+    description: str = ""
+    args_schema: Optional[Type[BaseModel]] = None
+    side_effect_free: bool = False
+    execution: ToolExecution = ToolExecution.THREAD
+    timeout: Optional[float] = 30.0
+    max_output_chars: int = 20_000
+
+    @abstractmethod
+    def run(self, arguments: Dict[str, Any]) -> Any:
+        """Execute the tool.
+
+        Args:
+            arguments: Tool arguments, validated against args_schema if set
+
+        Returns:
+            Tool output; non-string values are serialized to JSON
+
+        Raises:
+            ToolError: If the tool cannot complete the call
+        """
+        pass
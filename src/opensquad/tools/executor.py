@@ -0,0 +1,313 @@
+"""Concurrent executor for the tool calls of an agent turn."""
+
+import asyncio
+import inspect
+import json
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from types import TracebackType
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from pydantic import ValidationError
+
+from .base import Tool, ToolCall, ToolExecution, ToolResult
+
+_CacheKey = Tuple[str, str]
+
+
+class ToolExecutor:
+    """Execute the tool calls emitted by an agent turn.
+
+    Execution model:
+    - Consecutive side-effect-free calls run concurrently as one batch
+    - Calls with side effects run alone, in the order they were emitted,
+      so later calls observe their effects
+    - Coroutine tools run on the event loop; blocking tools run in a thread
+      or process pool depending on Tool.execution
+    - Each call is bounded by the tool's timeout and output size cap
+    - Successful side-effect-free results are memoized for the lifetime of
+      the executor (one run) and invalidated by any call with side effects
+
+    A timed-out thread or process call cannot be interrupted; its result is
+    discarded when it eventually finishes.
+    """
+
+    def __init__(
+        self,
+        tools: Iterable[Tool],
+        max_threads: Optional[int] = None,
+        max_processes: Optional[int] = None
+    ):
+        """Initialize the executor with the tools available in this run.
+
+        Args:
+            tools: Tools the agent may call; names must be unique
+            max_threads: Size of the thread pool for blocking tools
+            max_processes: Size of the process pool for CPU-bound tools
+        """
+        self.tools: Dict[str, Tool] = {}
+        for tool in tools:
+            if not tool.name:
+                raise ValueError(f"Tool {type(tool).__name__} has no name")
+            if tool.name in self.tools:
+                raise ValueError(f"Duplicate tool name: {tool.name}")
+            self.tools[tool.name] = tool
+        self.max_threads = max_threads
+        self.max_processes = max_processes
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._cache: Dict[_CacheKey, ToolResult] = {}
+        self._in_flight: Dict[_CacheKey, "asyncio.Future[ToolResult]"] = {}
+
+    async def __aenter__(self) -> "ToolExecutor":
+        """Enter the executor's context.
+
+        Returns:
+            The executor itself
+        """
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType]
+    ) -> None:
+        """Close the executor when leaving its context.
+
+        Args:
+            exc_type: Type of the exception raised in the context, if any
+            exc: Exception raised in the context, if any
+            tb: Traceback of that exception, if any
+        """
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker pools without waiting for abandoned calls."""
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._thread_pool = None
+        self._process_pool = None
+
+    def clear_cache(self) -> None:
+        """Drop all memoized results."""
+        self._cache.clear()
+
+    async def execute(self, calls: List[ToolCall]) -> List[ToolResult]:
+        """Execute the tool calls of one agent turn.
+
+        Args:
+            calls: Tool calls in the order the agent emitted them
+
+        Returns:
+            One result per call, in the same order as calls
+        """
+        results: List[Optional[ToolResult]] = [None] * len(calls)
+        batch: List[int] = []
+
+        for index, call in enumerate(calls):
+            tool = self.tools.get(call.name)
+            if tool is None or tool.side_effect_free:
+                batch.append(index)
+                continue
+            await self._execute_batch(calls, batch, results)
+            batch = []
+            results[index] = await self.execute_one(call)
+
+        await self._execute_batch(calls, batch, results)
+        return [result for result in results if result is not None]
+
+    async def execute_one(self, call: ToolCall) -> ToolResult:
+        """Execute a single tool call.
+
+        Args:
+            call: The tool call to execute
+
+        Returns:
+            Result of the call; failures are reported with status "failed"
+        """
+        tool = self.tools.get(call.name)
+        if tool is None:
+            return ToolResult(
+                call_id=call.id,
+                name=call.name,
+                status="failed",
+                error=f"Unknown tool: {call.name}"
+            )
+
+        try:
+            arguments = self._validate_arguments(tool, call.arguments)
+        except ValidationError as e:
+            details = "; ".join(
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+                for err in e.errors()
+            )
+            return ToolResult(
+                call_id=call.id,
+                name=call.name,
+                status="failed",
+                error=f"Invalid arguments for tool '{call.name}': {details}"
+            )
+
+        if not tool.side_effect_free:
+            self._cache.clear()
+            result = await self._invoke(tool, arguments)
+            return result.model_copy(update={"call_id": call.id})
+
+        key = (tool.name, json.dumps(arguments, sort_keys=True, default=str))
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached.model_copy(update={"call_id": call.id, "cached": True})
+
+        future = self._in_flight.get(key)
+        shared = future is not None
+        if future is None:
+            future = asyncio.ensure_future(self._invoke(tool, arguments))
+            self._in_flight[key] = future
+        try:
+            result = await future
+        finally:
+            if not shared:
+                self._in_flight.pop(key, None)
+        if not shared and result.status == "completed":
+            self._cache[key] = result
+        return result.model_copy(update={"call_id": call.id, "cached": shared})
+
+    async def _execute_batch(
+        self,
+        calls: List[ToolCall],
+        batch: List[int],
+        results: List[Optional[ToolResult]]
+    ) -> None:
+        """Execute a batch of side-effect-free calls concurrently.
+
+        Args:
+            calls: All tool calls of the turn
+            batch: Indices into calls of the calls to execute
+            results: Per-call results of the turn; filled in at those indices
+        """
+        if not batch:
+            return
+        batch_results = await asyncio.gather(*(self.execute_one(calls[i]) for i in batch))
+        for index, result in zip(batch, batch_results, strict=True):
+            results[index] = result
+
+    def _validate_arguments(self, tool: Tool, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate call arguments against the tool's schema.
+
+        Args:
+            tool: Tool being called
+            arguments: Arguments as emitted by the agent
+
+        Returns:
+            Arguments with defaults applied, or a copy if the tool has no schema
+
+        Raises:
+            ValidationError: If the arguments do not match the schema
+        """
+        if tool.args_schema is None:
+            return dict(arguments)
+        return tool.args_schema.model_validate(arguments).model_dump()
+
+    async def _invoke(self, tool: Tool, arguments: Dict[str, Any]) -> ToolResult:
+        """Run a tool with its timeout and output cap applied.
+
+        Args:
+            tool: Tool to run
+            arguments: Validated arguments
+
+        Returns:
+            Result without a call ID; errors and timeouts are reported with
+            status "failed"
+        """
+        start = time.monotonic()
+        try:
+            output = await asyncio.wait_for(self._run(tool, arguments), timeout=tool.timeout)
+        except asyncio.TimeoutError:
+            return self._failed(tool, f"Tool '{tool.name}' timed out after {tool.timeout}s", start)
+        except Exception as e:
+            return self._failed(tool, f"Error running tool '{tool.name}': {str(e)}", start)
+
+        text = self._format_output(output)
+        truncated = len(text) > tool.max_output_chars
+        if truncated:
+            omitted = len(text) - tool.max_output_chars
+            text = f"{text[:tool.max_output_chars]}\n... [truncated {omitted} characters]"
+        return ToolResult(
+            call_id="",
+            name=tool.name,
+            status="completed",
+            output=text,
+            truncated=truncated,
+            duration_seconds=time.monotonic() - start
+        )
+
+    async def _run(self, tool: Tool, arguments: Dict[str, Any]) -> Any:
+        """Run a tool on the event loop or in its worker pool.
+
+        Args:
+            tool: Tool to run
+            arguments: Validated arguments
+
+        Returns:
+            Raw tool output
+        """
+        if inspect.iscoroutinefunction(tool.run):
+            return await tool.run(arguments)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool_for(tool), tool.run, arguments)
+
+    def _pool_for(self, tool: Tool) -> Executor:
+        """Return the worker pool for a blocking tool, creating it on first use.
+
+        Args:
+            tool: Tool to run
+
+        Returns:
+            Process pool for PROCESS tools, thread pool otherwise
+        """
+        if tool.execution == ToolExecution.PROCESS:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.max_processes)
+            return self._process_pool
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.max_threads,
+                thread_name_prefix="opensquad-tool"
+            )
+        return self._thread_pool
+
+    def _format_output(self, output: Any) -> str:
+        """Convert tool output to text.
+
+        Args:
+            output: Raw tool output
+
+        Returns:
+            Strings unchanged, "" for None, JSON for anything else
+        """
+        if output is None:
+            return ""
+        if isinstance(output, str):
+            return output
+        return json.dumps(output, default=str)
+
+    def _failed(self, tool: Tool, error: str, start: float) -> ToolResult:
+        """Build a failed result.
+
+        Args:
+            tool: Tool that failed
+            error: Error message
+            start: Monotonic time the call started
+
+        Returns:
+            Failed result without a call ID
+        """
+        return ToolResult(
+            call_id="",
+            name=tool.name,
+            status="failed",
+            error=error,
+            duration_seconds=time.monotonic() - start
+        )
@@ -0,0 +1,149 @@
+"""File operation tools confined to a workspace directory."""
+
+from pathlib import Path, PurePath
+from typing import Any, Dict, Union
+
+from pydantic import BaseModel
+
+from .base import Tool, ToolError
+
+
+class ReadFileArgs(BaseModel):
+    """Arguments for ReadFileTool."""
+
+    path: str
+
+
+class ListFilesArgs(BaseModel):
+    """Arguments for ListFilesTool."""
+
+    path: str = "."
+    pattern: str = "**/*"
+
+
+class WriteFileArgs(BaseModel):
+    """Arguments for WriteFileTool."""
+
+    path: str
+    content: str
+
+
+class _WorkspaceTool(Tool):
+    """Base for tools operating on files below a workspace root."""
+
+    def __init__(self, root: Union[str, Path]):
+        """Initialize the tool with its workspace root.
+
+        Args:
+            root: Directory all paths are resolved against
+        """
+        self.root = Path(root).resolve()
+
+    def _resolve(self, path: str) -> Path:
+        """Resolve a workspace-relative path, following symlinks.
+
+        Args:
+            path: Path relative to the workspace root
+
+        Returns:
+            Absolute resolved path inside the workspace
+
+        Raises:
+            ToolError: If the path escapes the workspace or points into .git
+        """
+        resolved = (self.root / path).resolve()
+        if not resolved.is_relative_to(self.root):
+            raise ToolError(f"Path is outside the workspace: {path}")
+        # Git metadata is off limits: writing .git/config or hooks would let
+        # an agent run arbitrary commands through later git invocations.
+        if any(part.lower() == ".git" for part in resolved.relative_to(self.root).parts):
+            raise ToolError(f"Path is inside Git metadata: {path}")
+        return resolved
+
+
+class ReadFileTool(_WorkspaceTool):
+    """Read a text file from the workspace."""
+
+    name = "read_file"
+    description = "Read the contents of a text file in the workspace."
+    args_schema = ReadFileArgs
+    side_effect_free = True
+
+    def run(self, arguments: Dict[str, Any]) -> str:
+        """Read a file as UTF-8, replacing undecodable bytes.
+
+        Args:
+            arguments: Validated ReadFileArgs
+
+        Returns:
+            File contents
+
+        Raises:
+            ToolError: If the path is not allowed or is not a file
+        """
+        path = self._resolve(arguments["path"])
+        if not path.is_file():
+            raise ToolError(f"File not found: {arguments['path']}")
+        return path.read_text(encoding="utf-8", errors="replace")
+
+
+class ListFilesTool(_WorkspaceTool):
+    """List files in a workspace directory."""
+
+    name = "list_files"
+    description = "List files below a workspace directory matching a glob pattern."
+    args_schema = ListFilesArgs
+    side_effect_free = True
+
+    def run(self, arguments: Dict[str, Any]) -> str:
+        """List the files matching a pattern, skipping Git metadata.
+
+        Args:
+            arguments: Validated ListFilesArgs
+
+        Returns:
+            Sorted workspace-relative paths, one per line
+
+        Raises:
+            ToolError: If the directory is not allowed or missing, or the
+                pattern leaves the directory
+        """
+        directory = self._resolve(arguments["path"])
+        if not directory.is_dir():
+            raise ToolError(f"Directory not found: {arguments['path']}")
+        pattern = PurePath(arguments["pattern"])
+        if pattern.is_absolute() or ".." in pattern.parts:
+            raise ToolError(f"Pattern must stay inside the directory: {arguments['pattern']}")
+        files = sorted(
+            str(path.relative_to(self.root))
+            for path in directory.glob(arguments["pattern"])
+            if path.is_file()
+            and path.resolve().is_relative_to(self.root)
+            and ".git" not in path.relative_to(self.root).parts
+        )
+        return "\n".join(files)
+
+
+class WriteFileTool(_WorkspaceTool):
+    """Write a text file in the workspace."""
+
+    name = "write_file"
+    description = "Create or overwrite a text file in the workspace."
+    args_schema = WriteFileArgs
+
+    def run(self, arguments: Dict[str, Any]) -> str:
+        """Write a file as UTF-8, creating missing parent directories.
+
+        Args:
+            arguments: Validated WriteFileArgs
+
+        Returns:
+            Summary of what was written
+
+        Raises:
+            ToolError: If the path is not allowed
+        """
+        path = self._resolve(arguments["path"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(arguments["content"], encoding="utf-8")
+        return f"Wrote {len(arguments['content'])} characters to {arguments['path']}"
@@ -0,0 +1,133 @@
+"""Read-only Git tools backed by the git command line."""
+
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from pydantic import BaseModel, Field
+
+from .base import Tool, ToolError
+
+# The repository config is agent-writable and must not be able to run commands
+_SAFE_CONFIG = ("-c", "core.fsmonitor=false", "-c", "core.hooksPath=/dev/null")
+
+
+class GitStatusArgs(BaseModel):
+    """Arguments for GitStatusTool."""
+
+
+class GitDiffArgs(BaseModel):
+    """Arguments for GitDiffTool."""
+
+    path: Optional[str] = None
+    staged: bool = False
+
+
+class GitLogArgs(BaseModel):
+    """Arguments for GitLogTool."""
+
+    max_count: int = Field(default=10, ge=1, le=100)
+
+
+class _GitTool(Tool):
+    """Base for tools running git commands in a repository."""
+
+    side_effect_free = True
+
+    def __init__(self, repo_path: Union[str, Path]):
+        """Initialize the tool with the repository it operates on.
+
+        Args:
+            repo_path: Path to the Git working tree
+        """
+        self.repo_path = Path(repo_path)
+
+    async def _git(self, *args: str) -> str:
+        """Run a git command in the repository, killing it if cancelled.
+
+        Args:
+            args: Git subcommand and its arguments
+
+        Returns:
+            Standard output of the command
+
+        Raises:
+            ToolError: If git exits with a non-zero status
+        """
+        process = await asyncio.create_subprocess_exec(
+            "git", "-C", str(self.repo_path), *_SAFE_CONFIG, *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+        if process.returncode != 0:
+            raise ToolError(stderr.decode(errors="replace").strip() or
+                            f"git {args[0]} exited with status {process.returncode}")
+        return stdout.decode(errors="replace")
+
+
+class GitStatusTool(_GitTool):
+    """Show the working tree status."""
+
+    name = "git_status"
+    description = "Show the current branch and changed files in the repository."
+    args_schema = GitStatusArgs
+
+    async def run(self, arguments: Dict[str, Any]) -> str:
+        """Show the branch and changed files in short format.
+
+        Args:
+            arguments: Validated GitStatusArgs
+
+        Returns:
+            Output of git status --short --branch
+        """
+        return await self._git("status", "--short", "--branch")
+
+
+class GitDiffTool(_GitTool):
+    """Show uncommitted changes."""
+
+    name = "git_diff"
+    description = "Show unstaged (or staged) changes, optionally limited to one path."
+    args_schema = GitDiffArgs
+
+    async def run(self, arguments: Dict[str, Any]) -> str:
+        """Show the diff of the working tree or the staging area.
+
+        Args:
+            arguments: Validated GitDiffArgs
+
+        Returns:
+            Unified diff, empty if there are no changes
+        """
+        args = ["diff", "--no-ext-diff", "--no-textconv"]
+        if arguments["staged"]:
+            args.append("--staged")
+        if arguments["path"]:
+            args.extend(["--", arguments["path"]])
+        return await self._git(*args)
+
+
+class GitLogTool(_GitTool):
+    """Show recent commits."""
+
+    name = "git_log"
+    description = "Show the most recent commits as one line each."
+    args_schema = GitLogArgs
+
+    async def run(self, arguments: Dict[str, Any]) -> str:
+        """Show the most recent commits.
+
+        Args:
+            arguments: Validated GitLogArgs
+
+        Returns:
+            One line per commit with abbreviated hash and subject
+        """
+        return await self._git("log", "--oneline", f"--max-count={arguments['max_count']}")
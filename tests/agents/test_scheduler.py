@@ -0,0 +1,375 @@
+"""Tests for the LLM scheduler."""
+
+import asyncio
+import threading
+from typing import List, Optional
+from unittest.mock import MagicMock
+
+import pytest
+
+from opensquad.agents.base import AgentConfig, AgentRole
+from opensquad.agents.hello import HelloAgent
+from opensquad.agents.scheduler import (
+    LLMScheduler,
+    get_default_scheduler,
+    set_default_scheduler,
+)
+from opensquad.agents.structured import JsonStreamParser
+
+
+class FakeClock:
+    """Manually advanced clock for deterministic aging."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def run_queued(
+    scheduler: LLMScheduler,
+    requests: List[tuple],
+    clock: Optional[FakeClock] = None
+) -> List[str]:
+    """Queue requests behind a held slot, release it and return grant order."""
+    order: List[str] = []
+
+    async def request(name: str, role: str, priority: Optional[int], tenant: str) -> None:
+        async with scheduler.slot(role, priority=priority, tenant=tenant):
+            order.append(name)
+
+    async with scheduler.slot("reviewer"):
+        tasks = []
+        for name, role, priority, tenant, *delay in requests:
+            if clock and delay:
+                clock.now += delay[0]
+            tasks.append(asyncio.create_task(request(name, role, priority, tenant)))
+            await asyncio.sleep(0)
+        assert scheduler.metrics().queue_depth == len(requests)
+    await asyncio.gather(*tasks)
+    return order
+
+
+def test_scheduler_rejects_invalid_arguments():
+    """Test scheduler argument validation."""
+    with pytest.raises(ValueError):
+        LLMScheduler(max_concurrency=0)
+    with pytest.raises(ValueError):
+        LLMScheduler(aging_interval=0)
+
+
+def test_scheduler_priority_for():
+    """Test role priorities and per-request overrides."""
+    scheduler = LLMScheduler()
+    assert scheduler.priority_for("reviewer") < scheduler.priority_for("qa")
+    assert scheduler.priority_for(AgentRole.QA) == scheduler.priority_for("qa")
+    assert scheduler.priority_for("qa", priority=0) == 0
+    assert scheduler.priority_for("unknown") == 2
+
+
+@pytest.mark.asyncio
+async def test_scheduler_fast_path():
+    """Test that requests run immediately while capacity is free."""
+    scheduler = LLMScheduler(max_concurrency=2)
+    async with scheduler.slot("qa"):
+        async with scheduler.slot("qa"):
+            metrics = scheduler.metrics()
+            assert metrics.in_flight == 2
+            assert metrics.queue_depth == 0
+    metrics = scheduler.metrics()
+    assert metrics.in_flight == 0
+    assert metrics.granted == 2
+    assert metrics.max_wait_seconds == 0.0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_orders_by_role_priority():
+    """Test that an interactive reviewer request overtakes queued QA work."""
+    scheduler = LLMScheduler(max_concurrency=1)
+    order = await run_queued(scheduler, [
+        ("qa-1", "qa", None, "default"),
+        ("qa-2", "qa", None, "default"),
+        ("review", "reviewer", None, "default"),
+    ])
+    assert order == ["review", "qa-1", "qa-2"]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_per_request_priority():
+    """Test that a per-request priority overrides the role priority."""
+    scheduler = LLMScheduler(max_concurrency=1)
+    order = await run_queued(scheduler, [
+        ("review", "reviewer", None, "default"),
+        ("urgent-qa", "qa", -1, "default"),
+    ])
+    assert order == ["urgent-qa", "review"]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_aging_prevents_starvation():
+    """Test that long-waiting low-priority requests are eventually preferred."""
+    clock = FakeClock()
+    scheduler = LLMScheduler(max_concurrency=1, aging_interval=10.0, clock=clock)
+    order = await run_queued(scheduler, [
+        ("qa", "qa", None, "default"),
+        ("review", "reviewer", None, "default", 40.0),
+    ], clock)
+    assert order == ["qa", "review"]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_fair_across_tenants():
+    """Test that tenants with equal priority are interleaved."""
+    scheduler = LLMScheduler(max_concurrency=1)
+    order = await run_queued(scheduler, [
+        ("a1", "qa", None, "a"),
+        ("a2", "qa", None, "a"),
+        ("a3", "qa", None, "a"),
+        ("b1", "qa", None, "b"),
+        ("b2", "qa", None, "b"),
+    ])
+    assert order == ["a1", "b1", "a2", "b2", "a3"]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_tenant_weights():
+    """Test that tenant weights control each tenant's share."""
+    scheduler = LLMScheduler(max_concurrency=1, tenant_weights={"a": 2.0})
+    order = await run_queued(scheduler, [
+        ("a1", "qa", None, "a"),
+        ("a2", "qa", None, "a"),
+        ("a3", "qa", None, "a"),
+        ("a4", "qa", None, "a"),
+        ("b1", "qa", None, "b"),
+        ("b2", "qa", None, "b"),
+    ])
+    assert order == ["a1", "b1", "a2", "a3", "b2", "a4"]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_cancelled_waiter_is_removed():
+    """Test that cancelling a queued request removes it from the queue."""
+    scheduler = LLMScheduler(max_concurrency=1)
+    async with scheduler.slot("reviewer"):
+        task = asyncio.create_task(scheduler.slot("qa").__aenter__())
+        await asyncio.sleep(0)
+        assert scheduler.metrics().queue_depth == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert scheduler.metrics().queue_depth == 0
+    assert scheduler.metrics().in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_cancel_holder_then_waiter():
+    """Test that cancelling the slot holder and then its waiter leaves no leaked slot."""
+    scheduler = LLMScheduler(max_concurrency=1)
+    holding = asyncio.Event()
+
+    async def holder() -> None:
+        async with scheduler.slot("reviewer"):
+            holding.set()
+            await asyncio.sleep(10)
+
+    holder_task = asyncio.create_task(holder())
+    await holding.wait()
+    waiter_task = asyncio.create_task(_hold(scheduler, "qa", "default"))
+    await asyncio.sleep(0)
+    assert scheduler.metrics().queue_depth == 1
+
+    holder_task.cancel()
+    waiter_task.cancel()
+    results = await asyncio.gather(holder_task, waiter_task, return_exceptions=True)
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+
+    metrics = scheduler.metrics()
+    assert metrics.in_flight == 0
+    assert metrics.queue_depth == 0
+    await asyncio.wait_for(_hold(scheduler, "qa", "default"), timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_cancelled_waiters_do_not_consume_fair_share():
+    """Test that a tenant cancelling queued requests is not charged for them."""
+    scheduler = LLMScheduler(max_concurrency=1)
+    order: List[str] = []
+
+    async def request(name: str, tenant: str) -> None:
+        async with scheduler.slot("qa", tenant=tenant):
+            order.append(name)
+
+    async with scheduler.slot("reviewer"):
+        tasks = {}
+        for name, tenant in [("a1", "a"), ("a2", "a"), ("a3", "a")]:
+            tasks[name] = asyncio.create_task(request(name, tenant))
+            await asyncio.sleep(0)
+        for name in ("a2", "a3"):
+            tasks.pop(name).cancel()
+        await asyncio.sleep(0)
+        for name, tenant in [("a4", "a"), ("b1", "b"), ("b2", "b")]:
+            tasks[name] = asyncio.create_task(request(name, tenant))
+            await asyncio.sleep(0)
+        assert scheduler.metrics().queue_depth == 4
+    await asyncio.gather(*tasks.values())
+    assert order == ["a1", "b1", "a4", "b2"]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_wait_metrics():
+    """Test queue depth and wait-time metrics."""
+    clock = FakeClock()
+    scheduler = LLMScheduler(max_concurrency=1, clock=clock)
+    async with scheduler.slot("reviewer"):
+        task = asyncio.create_task(_hold(scheduler, "qa", "pipeline-1"))
+        await asyncio.sleep(0)
+        metrics = scheduler.metrics()
+        assert metrics.queue_depth_by_role == {"qa": 1}
+        assert metrics.queue_depth_by_tenant == {"pipeline-1": 1}
+        clock.now = 3.0
+    await task
+    metrics = scheduler.metrics()
+    assert metrics.granted == 2
+    assert metrics.max_wait_seconds == 3.0
+    assert metrics.avg_wait_seconds == 1.5
+    assert metrics.avg_wait_seconds_by_role == {"reviewer": 0.0, "qa": 3.0}
+
+
+async def _hold(scheduler: LLMScheduler, role: str, tenant: str) -> None:
+    async with scheduler.slot(role, tenant=tenant):
+        pass
+
+
+def test_default_scheduler():
+    """Test the shared default scheduler."""
+    custom = LLMScheduler()
+    set_default_scheduler(custom)
+    try:
+        assert get_default_scheduler() is custom
+        assert HelloAgent().scheduler is custom
+    finally:
+        set_default_scheduler(None)
+    assert get_default_scheduler() is not custom
+
+
+@pytest.mark.asyncio
+async def test_agent_llm_calls_use_scheduler():
+    """Test that agent LLM calls acquire a slot with the configured priority and tenant."""
+    scheduler = LLMScheduler(max_concurrency=1)
+    config = AgentConfig(
+        name="QAAgent",
+        role=AgentRole.QA,
+        priority=1,
+        tenant="pipeline-1"
+    )
+    agent = HelloAgent(config, scheduler=scheduler)
+    agent.llm = MagicMock()
+    agent.llm.invoke.return_value = "Response"
+
+    async with scheduler.slot("reviewer"):
+        task = asyncio.create_task(agent.process("Test"))
+        await asyncio.sleep(0.01)
+        metrics = scheduler.metrics()
+        assert metrics.queue_depth_by_role == {"qa": 1}
+        assert metrics.queue_depth_by_tenant == {"pipeline-1": 1}
+        assert scheduler._waiters[0].priority == 1
+    result = await task
+    assert result["status"] == "completed"
+    assert scheduler.metrics().granted == 2
+
+
+@pytest.mark.asyncio
+async def test_agent_invoke_requires_llm():
+    """Test that invoking without an LLM raises before taking a slot."""
+    agent = HelloAgent(scheduler=LLMScheduler())
+    agent.llm = None
+    with pytest.raises(RuntimeError):
+        await agent._invoke_llm("Test")
+    assert agent.scheduler.metrics().granted == 0
+
+
+@pytest.mark.asyncio
+async def test_agent_invoke_keeps_slot_until_thread_finishes():
+    """Test that cancelling an LLM call holds the slot until the worker thread returns."""
+    scheduler = LLMScheduler(max_concurrency=1)
+    agent = HelloAgent(scheduler=scheduler)
+    started = threading.Event()
+    finish = threading.Event()
+
+    def invoke(prompt: str) -> str:
+        started.set()
+        finish.wait(timeout=5)
+        return "Response"
+
+    agent.llm = MagicMock()
+    agent.llm.invoke.side_effect = invoke
+
+    task = asyncio.create_task(agent._invoke_llm("Test"))
+    await asyncio.to_thread(started.wait, 5)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert scheduler.metrics().in_flight == 1
+
+    finish.set()
+    await asyncio.wait_for(_hold(scheduler, "qa", "default"), timeout=5)
+    assert scheduler.metrics().in_flight == 0
+
+
+class StreamingLLM:
+    """LLM stub supporting both streaming and blocking calls."""
+
+    def __init__(self, chunks: List[str]):
+        self.chunks = chunks
+
+    async def astream(self, prompt: str):
+        for chunk in self.chunks:
+            yield chunk
+
+    def invoke(self, prompt: str) -> str:
+        return "nested"
+
+
+@pytest.mark.asyncio
+async def test_agent_stream_releases_slot_while_consumer_runs():
+    """Test that an LLM call made while consuming a stream is not blocked by it."""
+    scheduler = LLMScheduler(max_concurrency=1)
+    agent = HelloAgent(scheduler=scheduler)
+    agent.llm = StreamingLLM(["[1,", " 2]"])
+
+    items = []
+    responses = []
+    async for item in agent.stream_structured("prompt", lambda: JsonStreamParser(int)):
+        items.append(item)
+        responses.append(await asyncio.wait_for(agent._invoke_llm("nested"), timeout=5))
+    assert items == [1, 2]
+    assert responses == ["nested", "nested"]
+    assert scheduler.metrics().in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_agent_stream_closed_early_releases_slot():
+    """Test that closing a stream early aborts generation and frees the slot."""
+    scheduler = LLMScheduler(max_concurrency=1)
+    agent = HelloAgent(scheduler=scheduler)
+    agent.llm = StreamingLLM(["a", "b", "c"])
+
+    stream = agent._stream_llm("prompt")
+    assert await stream.__anext__() == "a"
+    await stream.aclose()
+    assert scheduler.metrics().in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_agent_stream_propagates_llm_errors():
+    """Test that generation errors reach the consumer and free the slot."""
+    scheduler = LLMScheduler(max_concurrency=1)
+    agent = HelloAgent(scheduler=scheduler)
+    agent.llm = MagicMock()
+    agent.llm.astream.side_effect = ConnectionError("backend down")
+
+    with pytest.raises(ConnectionError):
+        async for _ in agent._stream_llm("prompt"):
+            pass
+    assert scheduler.metrics().in_flight == 0
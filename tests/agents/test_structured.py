@@ -0,0 +1,277 @@
+"""Tests for incremental structured-output parsing."""
+
+import asyncio
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+from opensquad.agents.base import AgentConfig, AgentRole, BaseAgent
+from opensquad.agents.structured import (
+    CodeBlock,
+    CodeBlockStreamParser,
+    JsonStreamParser,
+    StructuredOutputError,
+)
+
+
+class FileChange(BaseModel):
+    """Schema used by the tests."""
+
+    path: str
+    lines: int
+
+
+class FakeLLM:
+    """LLM stub that streams predefined completions chunk by chunk.
+
+    A None chunk blocks the stream until it is cancelled.
+    """
+
+    def __init__(self, completions: List[List[str]]):
+        self.completions = completions
+        self.prompts: List[str] = []
+        self.chunks_sent = 0
+
+    async def astream(self, prompt: str):
+        self.prompts.append(prompt)
+        for chunk in self.completions[len(self.prompts) - 1]:
+            if chunk is None:
+                await asyncio.Event().wait()
+            self.chunks_sent += 1
+            yield chunk
+
+
+class StreamingAgent(BaseAgent):
+    """Concrete agent with a fake LLM for testing."""
+
+    def get_system_prompt(self) -> str:
+        return "Test system prompt"
+
+    async def process(self, task: str, context: dict | None = None) -> dict:
+        return {"status": "completed", "result": {}}
+
+
+def make_agent(completions: List[List[str]]) -> StreamingAgent:
+    agent = StreamingAgent(AgentConfig(name="TestAgent", role=AgentRole.BACKEND))
+    agent.llm = FakeLLM(completions)
+    return agent
+
+
+def test_json_parser_emits_items_as_they_close():
+    """Test that array elements are emitted as soon as they close."""
+    parser = JsonStreamParser(FileChange)
+    assert parser.feed('Here you go:\n```json\n[{"path": "a.py", ') == []
+    items = parser.feed('"lines": 3}, {"path": "b')
+    assert items == [FileChange(path="a.py", lines=3)]
+    assert parser.feed('.py", "lines": 5}]\n```') == [FileChange(path="b.py", lines=5)]
+    assert parser.close() == []
+
+
+def test_json_parser_skips_brackets_in_preamble():
+    """Test that brackets inside preamble prose do not start the root value."""
+    parser = JsonStreamParser(int)
+    assert parser.feed("Here are the counts [as requested]:\n  [1, 2]") == [1, 2]
+    parser.close()
+    parser = JsonStreamParser(FileChange)
+    items = parser.feed(
+        'Returning a list of {path, lines} objects:\n[{"path": "a.py", "lines": 1}]'
+    )
+    assert items == [FileChange(path="a.py", lines=1)]
+    parser.close()
+
+
+def test_json_parser_single_object():
+    """Test that a root object is emitted as a single item."""
+    parser = JsonStreamParser(FileChange)
+    assert parser.feed('{"path": "a}.py",') == []
+    assert parser.feed(' "lines": 1} trailing text') == [FileChange(path="a}.py", lines=1)]
+    parser.close()
+
+
+def test_json_parser_scalar_items():
+    """Test arrays of scalar values."""
+    parser = JsonStreamParser(int)
+    assert parser.feed("[1, 2") == [1]
+    assert parser.feed(",3]") == [2, 3]
+    parser.close()
+
+
+def test_json_parser_string_escapes():
+    """Test that escaped quotes inside strings do not end the item."""
+    parser = JsonStreamParser(str)
+    assert parser.feed('["a\\"]b", "c"]') == ['a"]b', "c"]
+
+
+def test_json_parser_fails_on_schema_mismatch():
+    """Test that an item failing validation aborts immediately."""
+    parser = JsonStreamParser(FileChange)
+    with pytest.raises(StructuredOutputError, match="schema"):
+        parser.feed('[{"path": "a.py", "lines": "many"}, {"path"')
+    with pytest.raises(StructuredOutputError):
+        parser.feed("more")
+
+
+def test_json_parser_fails_on_mismatched_bracket():
+    """Test that a mismatched bracket aborts before the item closes."""
+    parser = JsonStreamParser(FileChange)
+    with pytest.raises(StructuredOutputError, match="mismatched"):
+        parser.feed('[{"path": ["a.py"}')
+
+
+def test_json_parser_fails_on_missing_comma():
+    """Test that elements without a separating comma are rejected."""
+    parser = JsonStreamParser(int)
+    with pytest.raises(StructuredOutputError, match="expected ','"):
+        parser.feed("[1 2]")
+
+
+def test_json_parser_fails_on_trailing_comma():
+    """Test that a trailing comma is rejected."""
+    parser = JsonStreamParser(int)
+    with pytest.raises(StructuredOutputError, match="trailing"):
+        parser.feed("[1,]")
+
+
+def test_json_parser_fails_on_invalid_token():
+    """Test that invalid bare words are rejected."""
+    parser = JsonStreamParser(FileChange)
+    with pytest.raises(StructuredOutputError, match="unexpected character"):
+        parser.feed('[{path: 1}]')
+
+
+def test_json_parser_close_incomplete():
+    """Test that an unfinished value is reported on close."""
+    parser = JsonStreamParser(int)
+    parser.feed("[1, 2")
+    with pytest.raises(StructuredOutputError, match="ended"):
+        parser.close()
+
+
+def test_json_parser_close_without_json():
+    """Test that output without JSON is reported on close."""
+    parser = JsonStreamParser(int)
+    parser.feed("I cannot do that.")
+    with pytest.raises(StructuredOutputError, match="no JSON"):
+        parser.close()
+
+
+def test_code_block_parser_emits_blocks_as_they_close():
+    """Test that code blocks are emitted when their closing fence arrives."""
+    parser = CodeBlockStreamParser()
+    assert parser.feed("Intro\n```python src/app.py\nprint(1)\n") == []
+    assert parser.feed("print(2)\n``") == []
+    blocks = parser.feed("`\nOutro\n```\nplain\n```\n")
+    assert blocks == [
+        CodeBlock(language="python", info="python src/app.py", content="print(1)\nprint(2)"),
+        CodeBlock(language=None, info="", content="plain"),
+    ]
+    assert parser.close() == []
+
+
+def test_code_block_parser_closing_fence_at_end_of_stream():
+    """Test a closing fence without a trailing newline."""
+    parser = CodeBlockStreamParser()
+    assert parser.feed("```sh\nls\n```") == []
+    assert parser.close() == [CodeBlock(language="sh", info="sh", content="ls")]
+
+
+def test_code_block_parser_fails_on_unclosed_block():
+    """Test that a new opening fence inside a block aborts immediately."""
+    parser = CodeBlockStreamParser()
+    with pytest.raises(StructuredOutputError, match="before the previous block"):
+        parser.feed("```python\nx = 1\n```python\n")
+
+
+def test_code_block_parser_fails_on_unterminated_block():
+    """Test that an unterminated block is reported on close."""
+    parser = CodeBlockStreamParser()
+    parser.feed("```python\nx = 1\n")
+    with pytest.raises(StructuredOutputError, match="unterminated"):
+        parser.close()
+
+
+def test_code_block_parser_custom_schema():
+    """Test validating blocks against a custom schema."""
+
+    class PythonBlock(CodeBlock):
+        language: str
+
+    parser = CodeBlockStreamParser(PythonBlock)
+    with pytest.raises(StructuredOutputError, match="schema"):
+        parser.feed("```\nx = 1\n```\n")
+
+
+@pytest.mark.asyncio
+async def test_stream_structured_yields_items():
+    """Test that BaseAgent streams parsed items."""
+    agent = make_agent([['[{"path": "a.py", "lines": 1},', ' {"path": "b.py", "lines": 2}]']])
+    stream = agent.stream_structured("prompt", lambda: JsonStreamParser(FileChange))
+    items = [i async for i in stream]
+    assert [i.path for i in items] == ["a.py", "b.py"]
+    assert agent.llm.prompts == ["prompt"]
+
+
+@pytest.mark.asyncio
+async def test_stream_structured_aborts_and_retries():
+    """Test that invalid output aborts the stream and retries without duplicates."""
+    agent = make_agent([
+        ['[{"path": "a.py", "lines": 1},', ' {"path": ]', None, " never sent"],
+        ['[{"path": "a.py", "lines": 1},', ' {"path": "b.py", "lines": 2}]'],
+    ])
+    stream = agent.stream_structured("prompt", lambda: JsonStreamParser(FileChange))
+    items = [i async for i in stream]
+    assert [i.path for i in items] == ["a.py", "b.py"]
+    assert len(agent.llm.prompts) == 2
+    assert "previous response was invalid" in agent.llm.prompts[1]
+    assert '[{"path": "a.py", "lines": 1}]' in agent.llm.prompts[1]
+    assert "Repeat them exactly" in agent.llm.prompts[1]
+    assert agent.llm.chunks_sent == 4
+
+
+@pytest.mark.asyncio
+async def test_stream_structured_gives_up_after_retries():
+    """Test that persistent invalid output raises after max_retries."""
+    agent = make_agent([["nope"], ["still nope"]])
+    with pytest.raises(StructuredOutputError, match="2 attempts"):
+        async for _ in agent.stream_structured(
+            "prompt", lambda: JsonStreamParser(FileChange), max_retries=1
+        ):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_stream_structured_requires_llm():
+    """Test that streaming without an LLM raises."""
+    agent = StreamingAgent(AgentConfig(name="TestAgent", role=AgentRole.BACKEND))
+    with pytest.raises(RuntimeError):
+        async for _ in agent.stream_structured("prompt", CodeBlockStreamParser):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_stream_structured_fails_when_retry_diverges():
+    """Test that a retry producing different leading items fails instead of mixing outputs."""
+    agent = make_agent([
+        ['[{"path": "a.py", "lines": 1},', ' {"path": ]'],
+        ['[{"path": "c.py", "lines": 9},', ' {"path": "b.py", "lines": 2}]'],
+    ])
+    items = []
+    with pytest.raises(StructuredOutputError, match="diverged"):
+        async for item in agent.stream_structured(
+            "prompt", lambda: JsonStreamParser(FileChange)
+        ):
+            items.append(item)
+    assert [i.path for i in items] == ["a.py"]
+
+
+@pytest.mark.asyncio
+async def test_stream_structured_fails_when_retry_is_shorter():
+    """Test that a retry ending before the items already yielded fails."""
+    agent = make_agent([
+        ['[{"path": "a.py", "lines": 1},', ' {"path": ]'],
+        ["[]"],
+    ])
+    with pytest.raises(StructuredOutputError, match="diverged"):
+        async for _ in agent.stream_structured("prompt", lambda: JsonStreamParser(FileChange)):
+            pass
@@ -0,0 +1,264 @@
+"""Tests for ToolExecutor."""
+
+import asyncio
+import os
+import threading
+from typing import Any, Dict, List
+
+import pytest
+from pydantic import BaseModel
+
+from opensquad.tools.base import Tool, ToolCall, ToolError, ToolExecution
+from opensquad.tools.executor import ToolExecutor
+
+
+class EchoArgs(BaseModel):
+    """Arguments for EchoTool."""
+
+    text: str
+
+
+class EchoTool(Tool):
+    """Async read-only tool that records concurrency."""
+
+    name = "echo"
+    args_schema = EchoArgs
+    side_effect_free = True
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def run(self, arguments: Dict[str, Any]) -> str:
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return arguments["text"]
+
+
+class BlockingTool(Tool):
+    """Blocking read-only tool that only completes if all parties run concurrently."""
+
+    name = "blocking"
+    side_effect_free = True
+
+    def __init__(self, parties: int) -> None:
+        self.barrier = threading.Barrier(parties, timeout=5)
+        self.threads: List[str] = []
+
+    def run(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        self.barrier.wait()
+        self.threads.append(threading.current_thread().name)
+        return {"value": arguments.get("value")}
+
+
+class PidTool(Tool):
+    """CPU-bound tool run in the process pool."""
+
+    name = "pid"
+    side_effect_free = True
+    execution = ToolExecution.PROCESS
+
+    def run(self, arguments: Dict[str, Any]) -> int:
+        return os.getpid()
+
+
+class RecorderTool(Tool):
+    """Tool with side effects that records the order of events."""
+
+    name = "record"
+
+    def __init__(self, log: List[str]):
+        self.log = log
+
+    async def run(self, arguments: Dict[str, Any]) -> str:
+        self.log.append(arguments["event"])
+        return "ok"
+
+
+class FailingTool(Tool):
+    """Read-only tool that always fails."""
+
+    name = "fail"
+    side_effect_free = True
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def run(self, arguments: Dict[str, Any]) -> str:
+        self.calls += 1
+        raise ToolError("boom")
+
+
+class SlowTool(Tool):
+    """Tool that exceeds its timeout."""
+
+    name = "slow"
+    side_effect_free = True
+    timeout = 0.05
+
+    async def run(self, arguments: Dict[str, Any]) -> str:
+        await asyncio.sleep(1)
+        return "never"
+
+
+class BigTool(Tool):
+    """Tool producing more output than its cap."""
+
+    name = "big"
+    side_effect_free = True
+    max_output_chars = 10
+
+    def run(self, arguments: Dict[str, Any]) -> str:
+        return "x" * 25
+
+
+def call(call_id: str, name: str, **arguments: Any) -> ToolCall:
+    return ToolCall(id=call_id, name=name, arguments=arguments)
+
+
+def test_executor_rejects_duplicate_names():
+    """Test that tool names must be unique."""
+    with pytest.raises(ValueError):
+        ToolExecutor([EchoTool(), EchoTool()])
+
+
+def test_executor_rejects_unnamed_tool():
+    """Test that tools must have a name."""
+    tool = EchoTool()
+    tool.name = ""
+    with pytest.raises(ValueError):
+        ToolExecutor([tool])
+
+
+@pytest.mark.asyncio
+async def test_executor_runs_read_only_calls_concurrently():
+    """Test that independent read-only calls run concurrently."""
+    echo = EchoTool(delay=0.1)
+    async with ToolExecutor([echo]) as executor:
+        results = await executor.execute([call(str(i), "echo", text=f"t{i}") for i in range(5)])
+    assert [r.output for r in results] == ["t0", "t1", "t2", "t3", "t4"]
+    assert [r.call_id for r in results] == ["0", "1", "2", "3", "4"]
+    assert all(r.status == "completed" for r in results)
+    assert echo.max_active == 5
+
+
+@pytest.mark.asyncio
+async def test_executor_runs_blocking_tools_in_threads():
+    """Test that blocking tools run concurrently in the thread pool."""
+    blocking = BlockingTool(parties=4)
+    async with ToolExecutor([blocking], max_threads=4) as executor:
+        results = await executor.execute([call(str(i), "blocking", value=i) for i in range(4)])
+    assert [r.output for r in results] == [f'{{"value": {i}}}' for i in range(4)]
+    assert all(name.startswith("opensquad-tool") for name in blocking.threads)
+
+
+@pytest.mark.asyncio
+async def test_executor_runs_process_tools_in_processes():
+    """Test that process tools run outside the current process."""
+    async with ToolExecutor([PidTool()], max_processes=1) as executor:
+        results = await executor.execute([call("1", "pid")])
+    assert results[0].status == "completed"
+    assert int(results[0].output) != os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_executor_orders_side_effects():
+    """Test that calls with side effects act as barriers between batches."""
+    log: List[str] = []
+    echo = EchoTool()
+    async with ToolExecutor([echo, RecorderTool(log)]) as executor:
+        results = await executor.execute([
+            call("1", "echo", text="a"),
+            call("2", "record", event="write-1"),
+            call("3", "record", event="write-2"),
+            call("4", "echo", text="b"),
+        ])
+    assert log == ["write-1", "write-2"]
+    assert [r.call_id for r in results] == ["1", "2", "3", "4"]
+    assert echo.max_active == 1
+
+
+@pytest.mark.asyncio
+async def test_executor_memoizes_read_only_results():
+    """Test that identical read-only calls run once per run."""
+    echo = EchoTool()
+    async with ToolExecutor([echo]) as executor:
+        first = await executor.execute([call("1", "echo", text="a"), call("2", "echo", text="a")])
+        second = await executor.execute([call("3", "echo", text="a")])
+    assert echo.calls == 1
+    assert [r.cached for r in first] == [False, True]
+    assert second[0].cached is True
+    assert second[0].call_id == "3"
+    assert second[0].output == "a"
+
+
+@pytest.mark.asyncio
+async def test_executor_side_effects_invalidate_cache():
+    """Test that a call with side effects invalidates memoized results."""
+    echo = EchoTool()
+    async with ToolExecutor([echo, RecorderTool([])]) as executor:
+        await executor.execute([
+            call("1", "echo", text="a"),
+            call("2", "record", event="write"),
+            call("3", "echo", text="a"),
+        ])
+        assert echo.calls == 2
+        executor.clear_cache()
+        await executor.execute([call("4", "echo", text="a")])
+    assert echo.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_executor_does_not_cache_failures():
+    """Test that failed calls are retried rather than memoized."""
+    failing = FailingTool()
+    async with ToolExecutor([failing]) as executor:
+        await executor.execute([call("1", "fail")])
+        results = await executor.execute([call("2", "fail")])
+    assert failing.calls == 2
+    assert results[0].status == "failed"
+    assert "boom" in results[0].error
+
+
+@pytest.mark.asyncio
+async def test_executor_timeout():
+    """Test that calls exceeding the tool timeout fail."""
+    async with ToolExecutor([SlowTool()]) as executor:
+        results = await executor.execute([call("1", "slow")])
+    assert results[0].status == "failed"
+    assert "timed out" in results[0].error
+
+
+@pytest.mark.asyncio
+async def test_executor_truncates_output():
+    """Test that output beyond the tool cap is truncated."""
+    async with ToolExecutor([BigTool()]) as executor:
+        results = await executor.execute([call("1", "big")])
+    assert results[0].truncated is True
+    assert results[0].output.startswith("x" * 10)
+    assert "truncated 15 characters" in results[0].output
+
+
+@pytest.mark.asyncio
+async def test_executor_unknown_tool():
+    """Test that unknown tools fail without affecting other calls."""
+    async with ToolExecutor([EchoTool()]) as executor:
+        results = await executor.execute([call("1", "missing"), call("2", "echo", text="a")])
+    assert results[0].status == "failed"
+    assert "Unknown tool" in results[0].error
+    assert results[1].status == "completed"
+
+
+@pytest.mark.asyncio
+async def test_executor_invalid_arguments():
+    """Test that arguments are validated against the tool schema."""
+    async with ToolExecutor([EchoTool()]) as executor:
+        results = await executor.execute([call("1", "echo", txt="a")])
+    assert results[0].status == "failed"
+    assert "Invalid arguments" in results[0].error
+    assert "text" in results[0].error
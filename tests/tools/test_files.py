@@ -0,0 +1,129 @@
+"""Tests for file operation tools."""
+
+import pytest
+
+from opensquad.tools.base import ToolCall
+from opensquad.tools.executor import ToolExecutor
+from opensquad.tools.files import ListFilesTool, ReadFileTool, WriteFileTool
+
+
+@pytest.fixture
+def executor(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("print('hi')\n")
+    (tmp_path / "README.md").write_text("# Readme\n")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    executor = ToolExecutor([
+        ReadFileTool(tmp_path),
+        ListFilesTool(tmp_path),
+        WriteFileTool(tmp_path),
+    ])
+    yield executor
+    executor.close()
+
+
+@pytest.mark.asyncio
+async def test_read_file(executor):
+    """Test reading a file."""
+    results = await executor.execute([ToolCall(id="1", name="read_file", arguments={
+        "path": "src/app.py"
+    })])
+    assert results[0].output == "print('hi')\n"
+
+
+@pytest.mark.asyncio
+async def test_read_file_missing(executor):
+    """Test reading a missing file."""
+    results = await executor.execute([ToolCall(id="1", name="read_file", arguments={
+        "path": "nope.py"
+    })])
+    assert results[0].status == "failed"
+    assert "File not found" in results[0].error
+
+
+@pytest.mark.asyncio
+async def test_read_file_outside_workspace(executor):
+    """Test that paths escaping the workspace are rejected."""
+    results = await executor.execute([ToolCall(id="1", name="read_file", arguments={
+        "path": "../secret"
+    })])
+    assert results[0].status == "failed"
+    assert "outside the workspace" in results[0].error
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", [".git/config", ".git/hooks/x", "src/../.git/HEAD"])
+async def test_write_file_inside_git_metadata(executor, tmp_path, path):
+    """Test that writes into .git are rejected."""
+    results = await executor.execute([ToolCall(id="1", name="write_file", arguments={
+        "path": path, "content": "[core]\n\tfsmonitor = touch /tmp/pwned; false\n"
+    })])
+    assert results[0].status == "failed"
+    assert "Git metadata" in results[0].error
+    assert not (tmp_path / ".git" / "config").exists()
+    assert not (tmp_path / ".git" / "hooks").exists()
+
+
+@pytest.mark.asyncio
+async def test_read_file_inside_git_metadata(executor):
+    """Test that reads from .git are rejected."""
+    results = await executor.execute([ToolCall(id="1", name="read_file", arguments={
+        "path": ".git/HEAD"
+    })])
+    assert results[0].status == "failed"
+    assert "Git metadata" in results[0].error
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pattern", ["../*/*", "src/../../*", "/etc/*"])
+async def test_list_files_pattern_outside_workspace(executor, pattern):
+    """Test that glob patterns escaping the workspace are rejected."""
+    results = await executor.execute([ToolCall(id="1", name="list_files", arguments={
+        "pattern": pattern
+    })])
+    assert results[0].status == "failed"
+    assert "inside the directory" in results[0].error
+
+
+@pytest.mark.asyncio
+async def test_list_files_skips_symlinks_outside_workspace(executor, tmp_path_factory):
+    """Test that symlinked files resolving outside the workspace are not listed."""
+    outside = tmp_path_factory.mktemp("outside")
+    (outside / "id_rsa").write_text("secret\n")
+    root = executor.tools["list_files"].root
+    (root / "leak.txt").symlink_to(outside / "id_rsa")
+    results = await executor.execute([ToolCall(id="1", name="list_files")])
+    assert results[0].output.splitlines() == ["README.md", "src/app.py"]
+
+
+@pytest.mark.asyncio
+async def test_list_files(executor):
+    """Test listing files, skipping the .git directory."""
+    results = await executor.execute([ToolCall(id="1", name="list_files")])
+    assert results[0].output.splitlines() == ["README.md", "src/app.py"]
+
+
+@pytest.mark.asyncio
+async def test_list_files_missing_directory(executor):
+    """Test listing a missing directory."""
+    results = await executor.execute([ToolCall(id="1", name="list_files", arguments={
+        "path": "missing"
+    })])
+    assert results[0].status == "failed"
+
+
+@pytest.mark.asyncio
+async def test_write_then_read_sees_new_content(executor, tmp_path):
+    """Test that a write between reads invalidates the memoized read."""
+    read = ToolCall(id="1", name="read_file", arguments={"path": "src/app.py"})
+    write = ToolCall(id="2", name="write_file", arguments={
+        "path": "src/app.py", "content": "print('bye')\n"
+    })
+    reread = ToolCall(id="3", name="read_file", arguments={"path": "src/app.py"})
+    results = await executor.execute([read, write, reread])
+    assert results[0].output == "print('hi')\n"
+    assert results[1].output == "Wrote 13 characters to src/app.py"
+    assert results[2].output == "print('bye')\n"
+    assert results[2].cached is False
+    assert (tmp_path / "src" / "app.py").read_text() == "print('bye')\n"
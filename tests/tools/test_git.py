@@ -0,0 +1,84 @@
+"""Tests for Git tools."""
+
+import subprocess
+
+import pytest
+
+from opensquad.tools.base import ToolCall
+from opensquad.tools.executor import ToolExecutor
+from opensquad.tools.git import GitDiffTool, GitLogTool, GitStatusTool
+
+
+@pytest.fixture
+def repo(tmp_path):
+    def git(*args):
+        subprocess.run(["git", "-C", str(tmp_path), *args], check=True, capture_output=True)
+
+    git("init", "-q", "-b", "main")
+    git("config", "user.email", "test@example.com")
+    git("config", "user.name", "Test")
+    (tmp_path / "app.py").write_text("x = 1\n")
+    git("add", "app.py")
+    git("commit", "-q", "-m", "Initial commit")
+    (tmp_path / "app.py").write_text("x = 2\n")
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_git_tools_run_concurrently(repo):
+    """Test status, diff and log in a single turn."""
+    executor = ToolExecutor([GitStatusTool(repo), GitDiffTool(repo), GitLogTool(repo)])
+    results = await executor.execute([
+        ToolCall(id="1", name="git_status"),
+        ToolCall(id="2", name="git_diff", arguments={"path": "app.py"}),
+        ToolCall(id="3", name="git_log", arguments={"max_count": 1}),
+    ])
+    assert all(r.status == "completed" for r in results)
+    assert "## main" in results[0].output
+    assert " M app.py" in results[0].output
+    assert "+x = 2" in results[1].output
+    assert "Initial commit" in results[2].output
+
+
+@pytest.mark.asyncio
+async def test_git_diff_staged_empty(repo):
+    """Test diff of the (empty) staging area."""
+    executor = ToolExecutor([GitDiffTool(repo)])
+    results = await executor.execute([
+        ToolCall(id="1", name="git_diff", arguments={"staged": True})
+    ])
+    assert results[0].status == "completed"
+    assert results[0].output == ""
+
+
+@pytest.mark.asyncio
+async def test_git_log_rejects_invalid_count(repo):
+    """Test argument validation for git_log."""
+    executor = ToolExecutor([GitLogTool(repo)])
+    results = await executor.execute([ToolCall(id="1", name="git_log", arguments={
+        "max_count": 0
+    })])
+    assert results[0].status == "failed"
+
+
+@pytest.mark.asyncio
+async def test_git_tools_ignore_repo_fsmonitor_and_hooks(repo, tmp_path_factory):
+    """Test that commands configured in the repository are not executed."""
+    marker = tmp_path_factory.mktemp("marker") / "pwned"
+    subprocess.run(
+        ["git", "-C", str(repo), "config", "core.fsmonitor", f"touch {marker}; false"],
+        check=True
+    )
+    executor = ToolExecutor([GitStatusTool(repo)])
+    results = await executor.execute([ToolCall(id="1", name="git_status")])
+    assert results[0].status == "completed"
+    assert not marker.exists()
+
+
+@pytest.mark.asyncio
+async def test_git_error_is_reported(tmp_path):
+    """Test that git failures are reported as failed results."""
+    executor = ToolExecutor([GitStatusTool(tmp_path / "missing")])
+    results = await executor.execute([ToolCall(id="1", name="git_status")])
+    assert results[0].status == "failed"
+    assert results[0].error